@@ -1,22 +1,21 @@
 import numpy as np
-import matplotlib.pyplot as plt
-from mpl_toolkits.mplot3d import Axes3D
-import matplotlib.patches as patches
-from matplotlib.path import Path
 import sys
 import os
 import argparse
 import math
-from scipy.spatial.transform import Rotation as R
 
 # Add the submodule path
 sys.path.append(os.path.join(os.path.dirname(__file__), 'lib/gear-profile-generator'))
 import gear
 
+# Share the involute profile cache with the spur gear generator
+from gear_generator import _profile_points
+
 # For 3DM export
 try:
     import rhinoinside
     rhinoinside.load()
+    import System
     import Rhino
     import Rhino.Geometry as rg
     RHINO_AVAILABLE = True
@@ -45,7 +44,8 @@ class BevelGear:
         clearance : float
             Clearance coefficient
         backlash : float
-            Backlash
+            Backlash at the large end of the cone; like the other tooth
+            dimensions it scales toward the apex with each section
         profile_shift : float
             Profile shift coefficient
         frame_count : int
@@ -63,75 +63,83 @@ class BevelGear:
         
         # Calculate tooth width from module
         self.tooth_width = np.pi * module
+        self._pressure_angle_rad = gear.deg2rad(pressure_angle)
         
         # Calculate pitch radius at the large end of the cone
         self.pitch_radius = (teeth_number * module) / 2
         
-        # Generate gear profiles at different cone sections
-        self.sections = self._generate_sections()
+        # Calculate the cone apex distance
+        sin_cone = math.sin(math.radians(cone_angle))
+        self.apex_distance = self.pitch_radius / sin_cone
+        
+        # Generate gear profiles at different cone sections, stacked in one
+        # contiguous (sections, points, 3) buffer
+        self.sections, self._pts3d = self._generate_sections()
     
-    def _generate_sections(self, num_sections=10):
-        """Generate gear profiles at different sections along the cone"""
-        sections = []
+    def _base_profile(self):
+        """Generate the gear profile at the large end of the cone"""
+        # (cached, so mating gears with equal parameters share one profile)
+        base_points, _ = _profile_points(
+            self.teeth_number,
+            self.tooth_width,
+            self._pressure_angle_rad,
+            self.backlash,
+            self.frame_count
+        )
+        # float32 is ample for plotting/export precision and halves the footprint
+        return base_points.astype(np.float32)
+    
+    def _generate_sections(self, num_sections=None):
+        """
+        Generate gear profiles at different sections along the cone
         
-        # Calculate the cone apex distance
-        apex_distance = self.pitch_radius / math.sin(math.radians(self.cone_angle))
+        When num_sections is not given, it is chosen from the taper of the
+        cone: at least 10 sections, with more for steeply tapered gears.
         
-        # Generate sections from the large end to the small end
-        for i in range(num_sections):
-            # Position along the cone (0 = large end, 1 = small end)
-            t = i / (num_sections - 1)
-            
-            # Distance from the apex to this section
-            section_distance = apex_distance - t * self.face_width
-            
-            # Scale factor for this section
-            scale = section_distance / apex_distance
-            
-            # Effective module and pitch radius at this section
-            effective_module = self.module * scale
-            effective_radius = self.pitch_radius * scale
-            
-            # Generate gear profile for this section
-            if scale > 0.1:  # Avoid too small sections
-                tooth_width = np.pi * effective_module
-                gear_poly, _ = gear.generate(
-                    teeth_count=self.teeth_number,
-                    tooth_width=tooth_width,
-                    pressure_angle=gear.deg2rad(self.pressure_angle),
-                    backlash=self.backlash,
-                    frame_count=self.frame_count
-                )
-                
-                # Get points and scale them
-                points = np.array(gear_poly.exterior.coords)
-                
-                # Calculate z-coordinate for this section
-                z = t * self.face_width
-                
-                # Add section data
-                sections.append({
-                    'points': points,
-                    'z': z,
-                    'scale': scale,
-                    'radius': effective_radius
-                })
+        Returns the list of section dicts and the read-only
+        (sections, points, 3) buffer their 'points' are views into.
+        """
+        if num_sections is None:
+            scale_min = 1.0 - self.face_width / self.apex_distance
+            num_sections = max(10, int(np.ceil(-np.log(max(scale_min, 0.1)) * 8)))
+        
+        # Every section (backlash included) is the large-end profile scaled
+        # toward the apex, so generate the profile once and scale its points
+        base_points = self._base_profile()
+        
+        # Positions along the cone (0 = large end, 1 = small end) and the
+        # matching scale factors (distance to the apex / apex distance)
+        ts = np.arange(num_sections) / (num_sections - 1)
+        scales = 1.0 - ts * (self.face_width / self.apex_distance)
+        
+        # Avoid too small sections
+        keep = scales > 0.1
+        ts, scales = ts[keep], scales[keep]
+        zs = ts * self.face_width
         
-        return sections
+        # Fill all sections from the large end to the small end at once
+        pts3d = np.empty((len(scales), len(base_points), 3), dtype=np.float32)
+        pts3d[:, :, :2] = scales[:, None, None].astype(np.float32) * base_points[None, :, :]
+        pts3d[:, :, 2] = zs[:, None]
+        pts3d.flags.writeable = False  # Shared by all consumers
+        
+        sections = [{
+            'points': pts3d[i, :, :2],
+            'z': z,
+            'scale': scale,
+            'radius': self.pitch_radius * scale
+        } for i, (z, scale) in enumerate(zip(zs, scales))]
+        
+        return sections, pts3d
 
     def get_3d_points(self):
-        """Get 3D points for the gear"""
-        all_points = []
+        """
+        Get 3D points for the gear
         
-        for section in self.sections:
-            points_2d = section['points']
-            z = section['z']
-            
-            # Convert 2D points to 3D
-            points_3d = np.column_stack((points_2d, np.full(len(points_2d), z)))
-            all_points.append(points_3d)
-            
-        return all_points
+        Returns the shared, read-only (sections, points, 3) buffer itself;
+        callers iterate over its first axis.
+        """
+        return self._pts3d
 
 def create_rhino_bevel_gear(gear, hole_radius=5.0):
     """Create a Rhino 3D model of the bevel gear"""
@@ -146,7 +154,11 @@ def create_rhino_bevel_gear(gear, hole_radius=5.0):
     curves = []
     for section_points in sections:
         # Create a closed curve for this section
-        points3d = [rg.Point3d(p[0], p[1], p[2]) for p in section_points]
+        # (fill a presized Point3dList from plain floats instead of building
+        # a Python list of Point3d proxies that has to be marshaled again)
+        points3d = Rhino.Collections.Point3dList(len(section_points))
+        for x, y, z in section_points.tolist():
+            points3d.Add(x, y, z)
         curve = rg.Curve.CreateInterpolatedCurve(points3d, 3)
         if curve:
             curves.append(curve)
@@ -175,70 +187,32 @@ def create_rhino_bevel_gear(gear, hole_radius=5.0):
     
     return brep
 
-def export_bevel_gears(module, teeth1, teeth2, pressure_angle, cone_angle, face_width, 
-                       clearance, backlash, filename, frame_count):
+def export_bevel_gears(gear1, gear2, filename):
     """
-    Create and export bevel gears to a 3DM file
+    Export a pair of bevel gears to a 3DM file
     
     Parameters:
     -----------
-    module : float
-        Module (tooth size unit)
-    teeth1, teeth2 : int
-        Number of teeth for each gear
-    pressure_angle : float
-        Pressure angle in degrees
-    cone_angle : float
-        Cone angle in degrees
-    face_width : float
-        Width of the gear face
-    clearance, backlash : float
-        Gear parameters
+    gear1, gear2 : BevelGear
+        Gears to export; gear2 is positioned to mate with gear1 at 90°
     filename : str
         Output filename (.3dm)
-    frame_count : int
-        Number of points per curve
     """
     if not RHINO_AVAILABLE:
         print("Error: rhinoinside module not available. Cannot create 3DM file.")
         return
     
-    # Create the first bevel gear
-    gear1 = BevelGear(
-        module=module,
-        teeth_number=teeth1,
-        pressure_angle=pressure_angle,
-        cone_angle=cone_angle,
-        face_width=face_width,
-        clearance=clearance,
-        backlash=backlash,
-        frame_count=frame_count
-    )
-    
-    # Create the second bevel gear
-    gear2 = BevelGear(
-        module=module,
-        teeth_number=teeth2,
-        pressure_angle=pressure_angle,
-        cone_angle=90 - cone_angle,  # Complementary angle for 90° mating
-        face_width=face_width,
-        clearance=clearance,
-        backlash=backlash,
-        frame_count=frame_count
-    )
-    
     # Create Rhino 3D models
-    brep1 = create_rhino_bevel_gear(gear1, hole_radius=module*2)
-    brep2 = create_rhino_bevel_gear(gear2, hole_radius=module*2)
+    brep1 = create_rhino_bevel_gear(gear1, hole_radius=gear1.module*2)
+    brep2 = create_rhino_bevel_gear(gear2, hole_radius=gear2.module*2)
     
     # Position the second gear (rotate and translate)
     if brep2:
         # Create rotation transform (90 degrees around Y-axis)
         rotation = rg.Transform.Rotation(math.pi/2, rg.Vector3d(0, 1, 0), rg.Point3d(0, 0, 0))
         
-        # Calculate translation to position at the apex
-        apex_distance1 = gear1.pitch_radius / math.sin(math.radians(gear1.cone_angle))
-        translation = rg.Transform.Translation(apex_distance1, 0, 0)
+        # Translate to position at the apex
+        translation = rg.Transform.Translation(gear1.apex_distance, 0, 0)
         
         # Apply transforms
         brep2.Transform(rotation)
@@ -250,14 +224,14 @@ def export_bevel_gears(module, teeth1, teeth2, pressure_angle, cone_angle, face_
     # Add the gears to the file
     if brep1:
         attr1 = Rhino.DocObjects.ObjectAttributes()
-        attr1.Name = f"Bevel Gear {teeth1} teeth"
+        attr1.Name = f"Bevel Gear {gear1.teeth_number} teeth"
         attr1.ColorSource = Rhino.DocObjects.ObjectColorSource.ColorFromObject
         attr1.ObjectColor = System.Drawing.Color.LightGray
         file3dm.Objects.Add(brep1, attr1)
     
     if brep2:
         attr2 = Rhino.DocObjects.ObjectAttributes()
-        attr2.Name = f"Bevel Gear {teeth2} teeth"
+        attr2.Name = f"Bevel Gear {gear2.teeth_number} teeth"
         attr2.ColorSource = Rhino.DocObjects.ObjectColorSource.ColorFromObject
         attr2.ObjectColor = System.Drawing.Color.DarkGray
         file3dm.Objects.Add(brep2, attr2)
@@ -268,31 +242,33 @@ def export_bevel_gears(module, teeth1, teeth2, pressure_angle, cone_angle, face_
 
 def visualize_bevel_gears(gear1, gear2):
     """Visualize the bevel gears in 3D using Matplotlib"""
+    # Imported here so that 3DM-only runs don't pay for loading Matplotlib
+    import matplotlib.pyplot as plt
+    from mpl_toolkits.mplot3d import Axes3D
+    from mpl_toolkits.mplot3d.art3d import Line3DCollection
+    
     fig = plt.figure(figsize=(10, 8))
     ax = fig.add_subplot(111, projection='3d')
     
     # Plot the first gear
     sections1 = gear1.get_3d_points()
-    for section in sections1:
-        x, y, z = section[:, 0], section[:, 1], section[:, 2]
-        ax.plot(x, y, z, 'b-', alpha=0.5, linewidth=0.5)
+    ax.add_collection3d(Line3DCollection(sections1, colors='b', linewidths=0.5, alpha=0.5))
     
-    # Calculate apex distance and rotation for the second gear
-    apex_distance = gear1.pitch_radius / math.sin(math.radians(gear1.cone_angle))
+    # The second gear is placed at the apex of the first
+    apex_distance = gear1.apex_distance
     
-    # Plot the second gear (rotated 90 degrees)
+    # Plot the second gear (rotated 90 degrees about Y, then moved to the apex)
     sections2 = gear2.get_3d_points()
-    rot = R.from_euler('y', 90, degrees=True)
+    rot = np.array([[0.0, 0.0, 1.0],
+                    [0.0, 1.0, 0.0],
+                    [-1.0, 0.0, 0.0]], dtype=np.float32)
     
-    for section in sections2:
-        # Rotate points
-        rotated = rot.apply(section)
-        
-        # Translate to position
-        rotated[:, 0] += apex_distance
-        
-        x, y, z = rotated[:, 0], rotated[:, 1], rotated[:, 2]
-        ax.plot(x, y, z, 'r-', alpha=0.5, linewidth=0.5)
+    # Transform all sections at once
+    rotated_all = sections2.reshape(-1, 3) @ rot.T
+    rotated_all[:, 0] += apex_distance
+    
+    sections2_rotated = rotated_all.reshape(sections2.shape)
+    ax.add_collection3d(Line3DCollection(sections2_rotated, colors='r', linewidths=0.5, alpha=0.5))
     
     # Set equal aspect ratio
     ax.set_box_aspect([1, 1, 1])
@@ -304,9 +280,7 @@ def visualize_bevel_gears(gear1, gear2):
     ax.set_title('Bevel Gears (90° Mating)')
     
     # Set limits with some margin
-    max_radius = max(gear1.pitch_radius, gear2.pitch_radius)
-    max_width = max(gear1.face_width, gear2.face_width)
-    limit = max(max_radius, apex_distance) * 1.2
+    limit = max(gear1.pitch_radius, gear2.pitch_radius, gear1.apex_distance) * 1.2
     
     ax.set_xlim([-limit/2, limit + limit/2])
     ax.set_ylim([-limit, limit])
@@ -323,7 +297,7 @@ def main():
     parser.add_argument('--pressure-angle', type=float, default=20.0, help='Pressure angle in degrees')
     parser.add_argument('--cone-angle', type=float, default=45.0, help='Cone angle in degrees (typically 45° for 90° mating)')
     parser.add_argument('--face-width', type=float, default=15.0, help='Width of the gear face')
-    parser.add_argument('--backlash', type=float, default=0.0, help='Backlash')
+    parser.add_argument('--backlash', type=float, default=0.0, help='Backlash at the large end (scales toward the cone apex)')
     parser.add_argument('--clearance', type=float, default=0.25, help='Clearance coefficient')
     parser.add_argument('--save', type=str, help='Save 3D model to file (.3dm)')
     parser.add_argument('--save-image', type=str, help='Save visualization to image file')
@@ -357,6 +331,7 @@ def main():
     
     # Visualize the gears
     if args.show or args.save_image:
+        import matplotlib.pyplot as plt
         fig, ax = visualize_bevel_gears(gear1, gear2)
         
         # Save visualization if requested
@@ -373,18 +348,8 @@ def main():
         if not args.save.lower().endswith('.3dm'):
             args.save += '.3dm'
         
-        export_bevel_gears(
-            args.module,
-            args.teeth1,
-            args.teeth2,
-            args.pressure_angle,
-            args.cone_angle,
-            args.face_width,
-            args.clearance,
-            args.backlash,
-            args.save,
-            args.frame_count
-        )
+        # Reuse the gears already built above
+        export_bevel_gears(gear1, gear2, args.save)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,15 +1,32 @@
 import numpy as np
-import matplotlib.pyplot as plt
-import matplotlib.patches as patches
-from matplotlib.path import Path
 import sys
 import os
 import argparse
+import functools
 
 # Add the submodule path
 sys.path.append(os.path.join(os.path.dirname(__file__), 'lib/gear-profile-generator'))
 import gear
 
+@functools.lru_cache(maxsize=128)
+def _profile_points(teeth_count, tooth_width, pressure_angle_rad, backlash, frame_count):
+    """
+    Generate a gear profile as a read-only array of exterior points,
+    reusing the result for repeated parameters
+    
+    Also used by bevel_gear_generator.py, so both generators share one cache.
+    """
+    gear_poly, pitch_radius = gear.generate(
+        teeth_count=teeth_count,
+        tooth_width=tooth_width,
+        pressure_angle=pressure_angle_rad,
+        backlash=backlash,
+        frame_count=frame_count
+    )
+    points = np.asarray(gear_poly.exterior.coords, dtype=np.float64)
+    points.flags.writeable = False  # The cached array is handed to every caller
+    return points, pitch_radius
+
 class InvoluteGear:
     def __init__(self, module, teeth_number, pressure_angle=20.0, clearance=0.25, backlash=0.0, profile_shift=0, frame_count=32):
         """
@@ -43,13 +60,13 @@ class InvoluteGear:
         # Calculate tooth width from module
         self.tooth_width = np.pi * module
         
-        # Generate gear profile
-        self.gear_poly, self.pitch_radius = gear.generate(
-            teeth_count=teeth_number,
-            tooth_width=self.tooth_width,
-            pressure_angle=gear.deg2rad(pressure_angle),
-            backlash=backlash,
-            frame_count=frame_count  # Smoothness of the curve
+        # Generate gear profile points (cached and read-only)
+        self.points_2d, self.pitch_radius = _profile_points(
+            teeth_number,
+            self.tooth_width,
+            gear.deg2rad(pressure_angle),
+            backlash,
+            frame_count  # Smoothness of the curve
         )
     
     def points(self):
@@ -59,13 +76,11 @@ class InvoluteGear:
         Returns:
         --------
         numpy.ndarray
-            Array of gear profile points
+            Read-only array of gear profile points
         """
-        # Get exterior points from the Polygon object in gear.py
-        exterior_coords = np.array(self.gear_poly.exterior.coords)
-        return exterior_coords
+        return self.points_2d
 
-def create_gear_patch(gear, hole_radius=0.2, facecolor='lightgray'):
+def create_gear_patch(gear, hole_radius=0.2, facecolor='lightgray', transform_affine=None):
     """
     Create a Matplotlib patch from a gear profile
     
@@ -77,50 +92,43 @@ def create_gear_patch(gear, hole_radius=0.2, facecolor='lightgray'):
         Radius of the center hole
     facecolor : str
         Color of the gear
+    transform_affine : numpy.ndarray, optional
+        3x3 affine matrix baked into the vertices (e.g. to rotate and
+        position a mating gear)
         
     Returns:
     --------
     matplotlib.patches.PathPatch
         Patch representing the gear
     """
+    # Imported here so that using InvoluteGear alone doesn't load Matplotlib
+    import matplotlib.patches as patches
+    from matplotlib.path import Path
+    
     # Get points of the gear profile
     points = gear.points()
     
-    # Lists for vertices and codes
-    vertices = []
-    codes = []
-    
-    # Add the outer perimeter of the gear
-    for i, point in enumerate(points):
-        if i == 0:
-            codes.append(Path.MOVETO)
-        else:
-            codes.append(Path.LINETO)
-        vertices.append((point[0], point[1]))
+    # Outer perimeter of the gear, closed back to its first point
+    outer = np.asarray(points)
+    verts_outer = np.vstack([outer, outer[:1]])
+    codes_outer = np.full(len(verts_outer), Path.LINETO, dtype=Path.code_type)
+    codes_outer[0] = Path.MOVETO
+    codes_outer[-1] = Path.CLOSEPOLY
     
-    # Close the path
-    codes.append(Path.CLOSEPOLY)
-    vertices.append(vertices[0])
-    
-    # Add center hole
+    # Center hole, closed at (hole_radius, 0)
     theta = np.linspace(0, 2*np.pi, 50)
-    first_hole_point = True
-    for t in theta:
-        x = hole_radius * np.cos(t)
-        y = hole_radius * np.sin(t)
-        if first_hole_point:
-            codes.append(Path.MOVETO)
-            first_hole_point = False
-        else:
-            codes.append(Path.LINETO)
-        vertices.append((x, y))
+    verts_hole = np.column_stack([hole_radius * np.cos(theta), hole_radius * np.sin(theta)])
+    verts_hole = np.vstack([verts_hole, [[hole_radius, 0]]])
+    codes_hole = np.full(len(verts_hole), Path.LINETO, dtype=Path.code_type)
+    codes_hole[0] = Path.MOVETO
+    codes_hole[-1] = Path.CLOSEPOLY
     
-    # Close the hole
-    codes.append(Path.CLOSEPOLY)
-    vertices.append((hole_radius, 0))
+    vertices = np.vstack([verts_outer, verts_hole])
+    if transform_affine is not None:
+        vertices = vertices @ transform_affine[:2, :2].T + transform_affine[:2, 2]
     
     # Create path
-    path = Path(vertices, codes)
+    path = Path(vertices, np.concatenate([codes_outer, codes_hole]))
     patch = patches.PathPatch(path, facecolor=facecolor, edgecolor='black', lw=1.5)
     
     return patch, gear.pitch_radius
@@ -148,6 +156,8 @@ def export_gears_only(module, teeth1, teeth2, pressure_angle, clearance, backlas
     frame_count : int
         Number of points to generate per curve
     """
+    import matplotlib.pyplot as plt
+    
     # Create a figure with transparent background
     fig, ax = plt.subplots(figsize=(12, 10), facecolor='none')
     
@@ -180,9 +190,12 @@ def export_gears_only(module, teeth1, teeth2, pressure_angle, clearance, backlas
     rotation_angle = np.pi / teeth2  # Half tooth rotation
 
     # Generate and position the small gear
-    gear2, pitch_radius2 = create_gear_patch(gear2_obj, hole_radius=1.5, facecolor='darkgray')
-    transform = patches.Affine2D().rotate(rotation_angle).translate(center_distance, 0)
-    ax.add_patch(patches.PathPatch(gear2.get_path(), facecolor='darkgray', edgecolor='black', lw=1.5, transform=transform + ax.transData))
+    c, s = np.cos(rotation_angle), np.sin(rotation_angle)
+    transform_affine = np.array([[c, -s, center_distance],
+                                 [s, c, 0.0],
+                                 [0.0, 0.0, 1.0]])
+    gear2, pitch_radius2 = create_gear_patch(gear2_obj, hole_radius=1.5, facecolor='darkgray', transform_affine=transform_affine)
+    ax.add_patch(gear2)
 
     # Set equal axes
     margin = 1.2
@@ -212,6 +225,8 @@ def main():
     parser.add_argument('--show', type=bool, default=True, help='Show the figure')
     parser.add_argument('--frame-count', type=int, default=4, help='Number of points per curve (lower values = fewer vertices)')
     args = parser.parse_args()
+    
+    import matplotlib.pyplot as plt
 
     # If gears-only mode is requested and a filename is provided
     if args.gears_only and args.save:
@@ -267,9 +282,12 @@ def main():
     rotation_angle = np.pi / num_teeth2  # Half tooth rotation
 
     # Generate and position the small gear
-    gear2, pitch_radius2 = create_gear_patch(gear2_obj, hole_radius=1.5, facecolor='darkgray')
-    transform = patches.Affine2D().rotate(rotation_angle).translate(center_distance, 0)
-    ax.add_patch(patches.PathPatch(gear2.get_path(), facecolor='darkgray', edgecolor='black', lw=1.5, transform=transform + ax.transData))
+    c, s = np.cos(rotation_angle), np.sin(rotation_angle)
+    transform_affine = np.array([[c, -s, center_distance],
+                                 [s, c, 0.0],
+                                 [0.0, 0.0, 1.0]])
+    gear2, pitch_radius2 = create_gear_patch(gear2_obj, hole_radius=1.5, facecolor='darkgray', transform_affine=transform_affine)
+    ax.add_patch(gear2)
 
     # Display pitch circles (for reference)
     pitch_circle1 = plt.Circle((0, 0), pitch_radius1, fill=False, color='red', linestyle='--', alpha=0.7)